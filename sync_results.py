@@ -1,12 +1,34 @@
 import os
 import sys
 import argparse
+import atexit
+import functools
 import logging
-from typing import Any, Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from logging.handlers import MemoryHandler
+from typing import Any, Dict, List, Optional, Tuple
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from dotenv import load_dotenv
 
+# orjson parses and serializes JSON several times faster than the stdlib,
+# which matters for large paginated case/result responses. Fall back to the
+# stdlib when it is not installed.
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps
+except ImportError:
+    import json
+
+    _json_loads = json.loads
+
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode()
+
 
 # --------------------------------------------------------------------
 # Environment & logging setup
@@ -35,26 +57,68 @@ formatter = logging.Formatter(
     "%(asctime)s - %(levelname)s - %(funcName)s - %(message)s"
 )
 file_handler.setFormatter(formatter)
-logger.addHandler(file_handler)
+
+# Buffer error records in memory and write them to disk in batches, so a
+# burst of failed requests (e.g. during 429 retries) does not pay one
+# synchronous file write per record. CRITICAL records and process exit
+# flush the buffer, so nothing is lost on a crash.
+memory_handler = MemoryHandler(
+    capacity=128,
+    flushLevel=logging.CRITICAL,
+    target=file_handler,
+)
+logger.addHandler(memory_handler)
+atexit.register(memory_handler.flush)
 
 HEADERS = {
     "Token": API_TOKEN,
     "Accept": "application/json",
+    # Explicitly advertise compression: the repetitive JSON of large
+    # case/result listings compresses 3-10x, and requests/urllib3 transparently
+    # decompress the body before we parse it.
+    "Accept-Encoding": "gzip, deflate",
     "Content-Type": "application/json",
 }
 
 AUTOMATION_CF_TITLE_DEFAULT = "Automation Key"
 
+# Shared HTTP session:
+# - Keep-alive connections are reused across calls instead of paying a new
+#   TCP + TLS handshake per request.
+# - Transient failures (429 / 5xx) are retried with exponential backoff.
+SESSION = requests.Session()
+SESSION.headers.update(HEADERS)
+_adapter = HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=32,
+    max_retries=Retry(
+        total=3,
+        backoff_factor=0.3,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=["GET", "POST"],
+    ),
+)
+SESSION.mount("https://", _adapter)
+
+# (connect, read) timeouts so a stuck connection cannot hang the sync forever
+GET_TIMEOUT = (5, 30)
+POST_TIMEOUT = (5, 60)
+
 
 # --------------------------------------------------------------------
 # Generic API helpers
 # --------------------------------------------------------------------
 
-def api_get(path: str, params: Optional[Dict[str, Any]] = None) -> Any:
-    """Wrapper for GET requests to Qase API with basic error handling."""
+def api_get_uncached(path: str, params: Optional[Dict[str, Any]] = None) -> Any:
+    """
+    Wrapper for GET requests to Qase API with basic error handling.
+
+    Always hits the network; pagination loops use this directly since their
+    offsets never repeat and would only pollute the cache.
+    """
     url = f"{BASE_URL}{path}"
     try:
-        resp = requests.get(url, headers=HEADERS, params=params or {})
+        resp = SESSION.get(url, params=params or {}, timeout=GET_TIMEOUT)
     except Exception as exc:
         logger.error(f"GET {url} failed with exception: {exc}", exc_info=True)
         raise
@@ -63,7 +127,7 @@ def api_get(path: str, params: Optional[Dict[str, Any]] = None) -> Any:
         logger.error(f"GET {url} failed: {resp.status_code} {resp.text}")
         raise RuntimeError(f"GET {url} failed: {resp.status_code} {resp.text}")
 
-    data = resp.json()
+    data = _json_loads(resp.content)
     if not data.get("status", True):
         logger.error(f"GET {url} returned status=false: {data}")
         raise RuntimeError(f"GET {url} returned status=false: {data}")
@@ -71,11 +135,29 @@ def api_get(path: str, params: Optional[Dict[str, Any]] = None) -> Any:
     return data["result"]
 
 
+@functools.lru_cache(maxsize=256)
+def _cached_api_get(path: str, params_tuple: tuple) -> Any:
+    return api_get_uncached(path, dict(params_tuple))
+
+
+def api_get(path: str, params: Optional[Dict[str, Any]] = None) -> Any:
+    """
+    GET from the Qase API with an in-process response cache.
+
+    Inputs do not change within one sync, so idempotent metadata reads
+    (custom fields, run lookups) are served from memory after the first hit.
+    Params are flattened to a sorted tuple because dicts are not hashable.
+    """
+    params_tuple = tuple(sorted((params or {}).items()))
+    return _cached_api_get(path, params_tuple)
+
+
 def api_post(path: str, payload: Dict[str, Any]) -> Any:
     """Wrapper for POST requests to Qase API with basic error handling."""
     url = f"{BASE_URL}{path}"
     try:
-        resp = requests.post(url, headers=HEADERS, json=payload)
+        # Pre-serialized body; the session already carries the JSON Content-Type
+        resp = SESSION.post(url, data=_json_dumps(payload), timeout=POST_TIMEOUT)
     except Exception as exc:
         logger.error(f"POST {url} failed with exception: {exc}", exc_info=True)
         raise
@@ -84,7 +166,7 @@ def api_post(path: str, payload: Dict[str, Any]) -> Any:
         logger.error(f"POST {url} failed: {resp.status_code} {resp.text}")
         raise RuntimeError(f"POST {url} failed: {resp.status_code} {resp.text}")
 
-    data = resp.json()
+    data = _json_loads(resp.content)
     if not data.get("status", True):
         logger.error(f"POST {url} returned status=false: {data}")
         raise RuntimeError(f"POST {url} returned status=false: {data}")
@@ -92,6 +174,78 @@ def api_post(path: str, payload: Dict[str, Any]) -> Any:
     return data["result"]
 
 
+# --------------------------------------------------------------------
+# Pagination helpers
+# --------------------------------------------------------------------
+
+PAGE_LIMIT = 50
+
+# Maximum number of page fetches in flight at once when draining a
+# paginated list endpoint.
+MAX_CONCURRENT_PAGE_FETCHES = 8
+
+
+def _fetch_page(path: str, params: Optional[Dict[str, Any]], offset: int, limit: int) -> Any:
+    """Fetch a single page of a Qase list endpoint."""
+    page_params = dict(params or {})
+    page_params.update({"limit": limit, "offset": offset})
+    return api_get_uncached(path, params=page_params)
+
+
+def _iter_all_pages(
+    path: str,
+    params: Optional[Dict[str, Any]] = None,
+    limit: int = PAGE_LIMIT,
+):
+    """
+    Yield every entity from a paginated Qase list endpoint.
+
+    The first page is fetched to learn the total entity count; the remaining
+    offsets are then fetched in parallel over the pooled session instead of
+    serializing page N+1 behind page N's response. Entities are yielded page
+    by page as results come in, though the parallel fetchers may run ahead
+    of the consumer, buffering completed pages until they are drained.
+    """
+    first = _fetch_page(path, params, 0, limit)
+    entities = first.get("entities", [])
+    yield from entities
+    # Qase reports 'total' as the project-wide count and 'filtered' as the
+    # count after query filters; prefer 'filtered' so filtered listings
+    # (run=..., search=...) do not schedule offsets for entities the filter
+    # excludes. 'count' is deliberately not consulted: it is the size of the
+    # current page, not of the collection.
+    total = first.get("filtered", first.get("total"))
+
+    if total is None:
+        # Endpoint did not report a usable total; fall back to a sequential walk.
+        page = entities
+        offset = limit
+        while len(page) == limit:
+            page = _fetch_page(path, params, offset, limit).get("entities", [])
+            yield from page
+            offset += limit
+        return
+
+    remaining_offsets = range(limit, total, limit)
+    if remaining_offsets:
+        with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_PAGE_FETCHES) as executor:
+            pages = executor.map(
+                lambda off: _fetch_page(path, params, off, limit),
+                remaining_offsets,
+            )
+            for page in pages:
+                yield from page.get("entities", [])
+
+
+def _fetch_all_pages(
+    path: str,
+    params: Optional[Dict[str, Any]] = None,
+    limit: int = PAGE_LIMIT,
+) -> List[Dict[str, Any]]:
+    """Return every entity from a paginated Qase list endpoint as a list."""
+    return list(_iter_all_pages(path, params=params, limit=limit))
+
+
 # --------------------------------------------------------------------
 # Runs
 # --------------------------------------------------------------------
@@ -103,24 +257,17 @@ def get_run_by_id(project_code: str, run_id: int) -> Dict[str, Any]:
 
 
 def find_run_by_title(project_code: str, title: str) -> Optional[Dict[str, Any]]:
-    """Search for a run by its title in the given project."""
-    offset = 0
-    limit = 50
-
-    while True:
-        result = api_get(f"/run/{project_code}", params={"limit": limit, "offset": offset})
-        entities = result.get("entities", [])
-        if not entities:
-            break
-
-        for run in entities:
-            run_title = run.get("title") or run.get("name")
-            if run_title == title:
-                return run
+    """
+    Search for a run by its title in the given project.
 
-        if len(entities) < limit:
-            break
-        offset += limit
+    The title is passed as a server-side 'search' filter, so only matching
+    runs come back instead of every run in the project. Qase's search is
+    substring-based, so the exact title is still verified client-side.
+    """
+    for run in _iter_all_pages(f"/run/{project_code}", params={"search": title}):
+        run_title = run.get("title") or run.get("name")
+        if run_title == title:
+            return run
 
     return None
 
@@ -132,24 +279,24 @@ def get_latest_run(project_code: str) -> Dict[str, Any]:
     For simplicity in this assignment, we consider the run with the highest ID
     to be the newest one.
     """
-    offset = 0
-    limit = 50
     latest_run: Optional[Dict[str, Any]] = None
 
-    while True:
-        result = api_get(f"/run/{project_code}", params={"limit": limit, "offset": offset})
+    # Let the server sort: one request for the highest-ID run instead of
+    # paging through the whole project.
+    try:
+        result = api_get(
+            f"/run/{project_code}",
+            params={"limit": 1, "offset": 0, "sort": "id", "direction": "desc"},
+        )
         entities = result.get("entities", [])
-        if not entities:
-            break
-
-        for run in entities:
+        if entities:
+            latest_run = entities[0]
+    except RuntimeError:
+        # Server rejected the sort params; fall back to scanning every run.
+        for run in _iter_all_pages(f"/run/{project_code}"):
             if latest_run is None or run["id"] > latest_run["id"]:
                 latest_run = run
 
-        if len(entities) < limit:
-            break
-        offset += limit
-
     if latest_run is None:
         logger.error(f"No runs found in project {project_code}")
         raise RuntimeError(f"No runs found in project {project_code}")
@@ -163,38 +310,28 @@ def get_latest_run(project_code: str) -> Dict[str, Any]:
 # Results
 # --------------------------------------------------------------------
 
-def get_results_for_run(project_code: str, run_id: int) -> List[Dict[str, Any]]:
+def iter_results_for_run(project_code: str, run_id: int):
     """
-    Fetch all results for a specific run in a project.
+    Yield all results for a specific run in a project.
 
     Uses the 'run' query parameter, which worked correctly in your previous tests.
+    Streams page by page so callers never hold the full result list in memory.
     """
-    all_results: List[Dict[str, Any]] = []
-    offset = 0
-    limit = 50
-
-    while True:
-        result = api_get(
-            f"/result/{project_code}",
-            params={"limit": limit, "offset": offset, "run": run_id},
-        )
-        entities = result.get("entities", [])
-        all_results.extend(entities)
-
-        if len(entities) < limit:
-            break
-        offset += limit
-
-    print(f"[INFO] Fetched {len(all_results)} results for run {run_id} in {project_code}")
-    return all_results
+    yield from _iter_all_pages(f"/result/{project_code}", params={"run": run_id})
 
 
 # --------------------------------------------------------------------
 # Custom fields / Cases
 # --------------------------------------------------------------------
 
+@functools.lru_cache(maxsize=64)
 def get_custom_field_id_by_name(field_title: str) -> int:
-    """Return the ID of a custom field (for cases) based on its title."""
+    """
+    Return the ID of a custom field (for cases) based on its title.
+
+    The mapping is stable for the lifetime of the process, so the lookup is
+    memoized and only hits the API once per field title.
+    """
     result = api_get("/custom_field", params={"limit": 100, "offset": 0})
     for cf in result.get("entities", []):
         if cf.get("title") == field_title and cf.get("entity") == "case":
@@ -208,67 +345,87 @@ def get_custom_field_id_by_name(field_title: str) -> int:
 def get_cases_with_automation_key(
     project_code: str,
     automation_cf_id: int,
-) -> Dict[str, Dict[str, Any]]:
+) -> Tuple[Dict[int, str], Dict[str, Dict[str, Any]]]:
     """
-    Return a mapping:
-        automation_key (str) -> case_entity (dict)
-    Only for cases that have the Automation Key custom field filled.
+    Return two mappings, only for cases that have the Automation Key custom
+    field filled:
+        case_id (int) -> automation_key (str)
+        automation_key (str) -> minimal case dict (id, title, description)
+
+    Only the fields needed for run membership and cloning are kept, so the
+    footprint stays small even when cases carry many custom fields.
     """
+    caseid_to_key: Dict[int, str] = {}
     by_key: Dict[str, Dict[str, Any]] = {}
-    offset = 0
-    limit = 50
-
-    while True:
-        result = api_get(f"/case/{project_code}", params={"limit": limit, "offset": offset})
-        entities = result.get("entities", [])
-        if not entities:
-            break
-
-        for case in entities:
-            cf_list = case.get("custom_fields", [])
-            auto_val = None
-            for cf in cf_list:
-                if cf.get("id") == automation_cf_id:
-                    auto_val = cf.get("value")
-                    break
 
-            if auto_val:
-                by_key[auto_val] = case
-
-        if len(entities) < limit:
-            break
-        offset += limit
+    # Hot loop over every case in the project: `or ()` avoids allocating a
+    # fresh default list per case, and the explicit break-on-match loop skips
+    # the generator machinery of a next() expression.
+    for case in _iter_all_pages(f"/case/{project_code}"):
+        for cf in case.get("custom_fields") or ():
+            if cf.get("id") == automation_cf_id:
+                auto_val = cf.get("value")
+                if auto_val:
+                    case_id = case["id"]
+                    caseid_to_key[case_id] = auto_val
+                    by_key[auto_val] = {
+                        "id": case_id,
+                        "title": case.get("title"),
+                        "description": case.get("description", ""),
+                    }
+                break
 
     print(f"[INFO] Project {project_code}: found {len(by_key)} cases with Automation Key")
-    return by_key
+    return caseid_to_key, by_key
 
 
-def create_case_in_target(
+def create_cases_in_target_bulk(
     target_project: str,
-    source_case: Dict[str, Any],
+    source_cases_by_key: Dict[str, Dict[str, Any]],
     automation_cf_id: int,
-    automation_key: str,
-) -> Dict[str, Any]:
+    missing_keys: List[str],
+) -> Dict[str, Dict[str, Any]]:
     """
-    Create a test case in the target project, cloning basic information from the
-    source case and applying the same Automation Key.
+    Create test cases in the target project in a single bulk request, cloning
+    basic information from the source cases and applying the same Automation
+    Keys.
+
+    Returns a mapping automation_key -> created case (minimal dict), suitable
+    for merging into the target case map.
     """
-    payload = {
-        "title": source_case.get("title") or f"Auto-created {automation_key}",
-        "description": source_case.get("description", ""),
-        "custom_fields": [
-            {"id": automation_cf_id, "value": automation_key}
-        ],
-    }
+    case_payloads = []
+    for automation_key in missing_keys:
+        source_case = source_cases_by_key[automation_key]
+        case_payloads.append(
+            {
+                "title": source_case.get("title") or f"Auto-created {automation_key}",
+                "description": source_case.get("description", ""),
+                "custom_fields": [
+                    {"id": automation_cf_id, "value": automation_key}
+                ],
+            }
+        )
 
-    result = api_post(f"/case/{target_project}", payload)
-    new_id = result["id"]
-    print(f"[INFO] Created case in {target_project}: id={new_id} key={automation_key}")
-    return {
-        "id": new_id,
-        "title": payload["title"],
-        "custom_fields": payload["custom_fields"],
-    }
+    result = api_post(f"/case/{target_project}/bulk", {"cases": case_payloads})
+    new_ids = result.get("ids", [])
+    if len(new_ids) != len(case_payloads):
+        msg = (
+            f"Bulk case creation in {target_project} returned {len(new_ids)} ids "
+            f"for {len(case_payloads)} cases: {result}"
+        )
+        logger.error(msg)
+        raise RuntimeError(msg)
+
+    created: Dict[str, Dict[str, Any]] = {}
+    for automation_key, payload, new_id in zip(missing_keys, case_payloads, new_ids):
+        created[automation_key] = {
+            "id": new_id,
+            "title": payload["title"],
+            "custom_fields": payload["custom_fields"],
+        }
+
+    print(f"[INFO] Created {len(created)} cases in {target_project} (bulk)")
+    return created
 
 
 # --------------------------------------------------------------------
@@ -301,7 +458,9 @@ def get_or_create_target_run(
         "description": (
             f"Auto-created mirror of run {source_run['id']} from project {source_project}"
         ),
-        "cases": sorted(set(case_ids_for_run)),
+        # Single-pass dedupe preserving first-seen order; the endpoint treats
+        # this as a membership set, so no sort is needed.
+        "cases": list(dict.fromkeys(case_ids_for_run)),
     }
     created = api_post(f"/run/{target_project}", payload)
     run_id = created["id"]
@@ -313,17 +472,16 @@ def get_or_create_target_run(
 # Target results
 # --------------------------------------------------------------------
 
-def create_result_in_target(
-    target_project: str,
-    target_run_id: int,
+# Qase accepts at most this many results per bulk request.
+RESULT_BULK_CHUNK_SIZE = 100
+
+
+def build_result_payload(
     target_case_id: int,
     source_result: Dict[str, Any],
     source_project: str,
-):
-    """
-    Create a result in the target run for a given case, cloning information from
-    the source result.
-    """
+) -> Dict[str, Any]:
+    """Build a single result payload for the target run, cloned from the source."""
     status = source_result.get("status", "passed")
     comment = source_result.get("comment") or ""
     time_spent = source_result.get("time")
@@ -337,8 +495,24 @@ def create_result_in_target(
     if time_spent is not None:
         payload["time"] = time_spent
 
-    api_post(f"/result/{target_project}/{target_run_id}", payload)
-    print(f"    [OK] Result for case_id={target_case_id} status={status}")
+    return payload
+
+
+def create_results_bulk(
+    target_project: str,
+    target_run_id: int,
+    items: List[Dict[str, Any]],
+):
+    """
+    Create results in the target run through the bulk endpoint.
+
+    One request per chunk of RESULT_BULK_CHUNK_SIZE replaces one request per
+    result, so a run with hundreds of results costs a handful of round trips.
+    """
+    for start in range(0, len(items), RESULT_BULK_CHUNK_SIZE):
+        chunk = items[start:start + RESULT_BULK_CHUNK_SIZE]
+        api_post(f"/result/{target_project}/{target_run_id}/bulk", {"results": chunk})
+        print(f"    [OK] Posted {start + len(chunk)}/{len(items)} results")
 
 
 # --------------------------------------------------------------------
@@ -351,16 +525,19 @@ def sync_run(
     source_run: Dict[str, Any],
     target_run_title: str,
     automation_cf_title: str,
+    dedupe_results: bool = False,
 ):
     """
     Sync a single run from source_project to target_project based on Automation Key.
 
     Steps:
-    1. Fetch results from the source run.
-    2. Build a mapping from source cases to Automation Keys.
-    3. Ensure all relevant cases exist in the target project (create if needed).
-    4. Find or create the target run.
-    5. Create corresponding results in the target run.
+    1. Build a mapping from source cases to Automation Keys.
+    2. Stream results from the source run, resolving each to its
+       Automation Key.
+    3. Optionally keep only the last result per case (dedupe_results).
+    4. Create all missing target cases in one bulk request.
+    5. Find or create the target run.
+    6. Create the corresponding results in the target run.
     """
     run_id = source_run["id"]
     source_run_title = source_run.get("title") or source_run.get("name")
@@ -370,56 +547,107 @@ def sync_run(
         f"(target run title='{target_run_title}')"
     )
 
-    # 1) Fetch results from the source run
-    results = get_results_for_run(source_project, run_id)
-    if not results:
-        print("[WARN] No results found for this run. Nothing to sync.")
-        return
-
-    # 2) Find Automation Key custom field ID
+    # 1) Find Automation Key custom field ID
     automation_cf_id = get_custom_field_id_by_name(automation_cf_title)
 
-    # 3) Source cases by Automation Key
-    source_cases_by_key = get_cases_with_automation_key(source_project, automation_cf_id)
-    source_caseid_to_key: Dict[int, str] = {}
-    for key, case in source_cases_by_key.items():
-        source_caseid_to_key[case["id"]] = key
-
-    # 4) Target cases by Automation Key
-    target_cases_by_key = get_cases_with_automation_key(target_project, automation_cf_id)
-
-    # 5) Ensure all cases referenced in the source run exist in the target project
-    target_case_ids_for_run: List[int] = []
+    # 2+3) Source and target cases by Automation Key. The two project scans
+    # are independent paginated reads, so run them concurrently; the pooled
+    # session is thread-safe and sized for it.
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        source_future = executor.submit(
+            get_cases_with_automation_key, source_project, automation_cf_id
+        )
+        target_future = executor.submit(
+            get_cases_with_automation_key, target_project, automation_cf_id
+        )
+        source_caseid_to_key, source_cases_by_key = source_future.result()
+        _, target_cases_by_key = target_future.result()
+
+    # 4) Stream the source results once, resolving each to its Automation Key
+    resolved: List[tuple] = []  # (auto_key, source_result)
+    total_results = 0
+    skipped_no_case_id = 0
+    skipped_no_key = 0
+
+    # Hoist the bound methods used on every iteration; attribute lookups in
+    # a loop over thousands of results add up.
+    key_for_case = source_caseid_to_key.get
+    add_resolved = resolved.append
+
+    # Skips are counted and summarized after the loop rather than printed
+    # per result: a run with thousands of unmapped results would otherwise
+    # spend its time in synchronous stdout writes.
+    for r in iter_results_for_run(source_project, run_id):
+        total_results += 1
 
-    for r in results:
         src_case_id = r.get("case_id")
         if not src_case_id:
-            print("[WARN] Result without case_id found, skipping.")
+            skipped_no_case_id += 1
             continue
 
-        auto_key = source_caseid_to_key.get(src_case_id)
+        auto_key = key_for_case(src_case_id)
         if not auto_key:
-            print(f"[WARN] Source case_id={src_case_id} has no Automation Key, skipping.")
+            skipped_no_key += 1
             continue
 
-        target_case = target_cases_by_key.get(auto_key)
-        if not target_case:
-            source_case = source_cases_by_key[auto_key]
-            target_case = create_case_in_target(
+        add_resolved((auto_key, r))
+
+    print(f"[INFO] Fetched {total_results} results for run {run_id} in {source_project}")
+    if skipped_no_case_id:
+        print(f"[WARN] Skipped {skipped_no_case_id} results without case_id.")
+    if skipped_no_key:
+        print(f"[WARN] Skipped {skipped_no_key} results whose source case has no Automation Key.")
+
+    if not total_results:
+        print("[WARN] No results found for this run. Nothing to sync.")
+        return
+
+    # 5) Optionally collapse retries: keep only the last result per source
+    # case, mirroring the final verdict instead of every attempt
+    if dedupe_results:
+        latest_by_case: Dict[int, tuple] = {}
+        for auto_key, r in resolved:
+            latest_by_case[r["case_id"]] = (auto_key, r)
+        dropped = len(resolved) - len(latest_by_case)
+        if dropped:
+            print(f"[INFO] Deduplicated {dropped} repeated results by case_id")
+        resolved = list(latest_by_case.values())
+
+    # 6) Create all missing target cases in one bulk request instead of one
+    # POST per missing case
+    missing_keys = list(dict.fromkeys(
+        auto_key for auto_key, _ in resolved if auto_key not in target_cases_by_key
+    ))
+    if missing_keys:
+        target_cases_by_key.update(
+            create_cases_in_target_bulk(
                 target_project,
-                source_case,
+                source_cases_by_key,
                 automation_cf_id,
-                auto_key,
+                missing_keys,
             )
-            target_cases_by_key[auto_key] = target_case
+        )
 
-        target_case_ids_for_run.append(target_case["id"])
+    # 7) Resolve each result to its target case ID exactly once; the run
+    # membership and the mirrored payloads are both derived from this list
+    by_key_get = target_cases_by_key.get
+    resolved_cases: List[Tuple[int, Dict[str, Any]]] = []
+    for auto_key, r in resolved:
+        target_case = by_key_get(auto_key)
+        if target_case:
+            resolved_cases.append((target_case["id"], r))
+
+    target_case_ids_for_run = [case_id for case_id, _ in resolved_cases]
+    items = [
+        build_result_payload(case_id, r, source_project)
+        for case_id, r in resolved_cases
+    ]
 
     if not target_case_ids_for_run:
         print("[WARN] No cases with Automation Key to mirror. Stopping.")
         return
 
-    # 6) Find or create the target run
+    # 8) Find or create the target run
     target_run_id = get_or_create_target_run(
         target_project,
         target_run_title,
@@ -428,28 +656,9 @@ def sync_run(
         target_case_ids_for_run,
     )
 
-    # 7) Create mirrored results in the target run
+    # 9) Create the mirrored results collected above
     print(f"[INFO] Creating results in {target_project} run_id={target_run_id} ...")
-    for r in results:
-        src_case_id = r.get("case_id")
-        if not src_case_id:
-            continue
-
-        auto_key = source_caseid_to_key.get(src_case_id)
-        if not auto_key:
-            continue
-
-        target_case = target_cases_by_key.get(auto_key)
-        if not target_case:
-            continue
-
-        create_result_in_target(
-            target_project,
-            target_run_id,
-            target_case["id"],
-            r,
-            source_project,
-        )
+    create_results_bulk(target_project, target_run_id, items)
 
     print("[INFO] Sync completed.")
 
@@ -517,6 +726,15 @@ def main():
         help="Title of the custom field used as Automation Key (default: 'Automation Key').",
     )
 
+    parser.add_argument(
+        "--dedupe-results",
+        action="store_true",
+        help=(
+            "Mirror only the last result per case instead of every attempt "
+            "(useful when the source run contains retries)."
+        ),
+    )
+
     args = parser.parse_args()
 
     source_project = args.source_project
@@ -562,6 +780,7 @@ def main():
         source_run=source_run,
         target_run_title=target_run_title,
         automation_cf_title=args.automation_field_title,
+        dedupe_results=args.dedupe_results,
     )
 
 